@@ -0,0 +1,93 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+
+class AsyncAdmission:
+    """Caps how many upstream calls the gateway has in flight at once.
+
+    A semaphore whose limit can be changed at runtime with `resize`.
+    Callers beyond `cmax` queue in FIFO order and a released slot is handed
+    straight to the next one, so a waiter that is cancelled after being
+    woken passes its slot on instead of losing it.
+    """
+
+    def __init__(self, cmax: int):
+        self._cmax = cmax
+        self._active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._cmax
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self):
+        if self._active < self._cmax and not self._waiters:
+            self._active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation landed
+                self.release()
+            else:
+                # A release may already have popped the cancelled future
+                try:
+                    self._waiters.remove(future)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self):
+        self._active -= 1
+        self._wake()
+
+    def resize(self, cmax: int):
+        self._cmax = cmax
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self._active < self._cmax:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._active += 1
+                future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class AdmissionControl(SchemaExtension):
+    """Executes each mutation operation inside a slot of context["admission"].
+
+    Hooks on_execute rather than resolve: an extension that overrides
+    resolve makes Strawberry wrap every field of every query in it.
+    Mutation fields run one after another, so one slot per operation still
+    bounds its upstream writes.
+    """
+
+    async def on_execute(self):
+        execution_context = self.execution_context
+        if execution_context.operation_type is not OperationType.MUTATION:
+            yield
+            return
+        async with execution_context.context["admission"].slot():
+            yield
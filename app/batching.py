@@ -0,0 +1,95 @@
+import asyncio
+import orjson
+from app.config import settings
+from app.encoding import dumps
+from app.tenant import tenant_json_headers
+from app.upstream import UpstreamError
+
+
+class Batcher:
+    """Coalesces concurrent writes into a single bulk POST upstream.
+
+    Submissions for the same (client, tenant) are held for at most
+    `flush_ms` or until `max_size` have queued, then sent together as
+    {key: [payload, ...]}. The upstream must answer with a list of results
+    in the same order, which are handed back to the waiting callers. A batch
+    of one goes to `single_url` as a plain POST of the payload, so an
+    uncontended write does not need the bulk endpoint.
+
+    Callers cancelled while queued are dropped before the batch is sent;
+    once the request is on its way, a cancelled caller's write still
+    happens and only its result is discarded.
+    """
+
+    def __init__(self, url: str, key: str, single_url: str,
+                 flush_ms: float = settings.WRITE_BATCH_FLUSH_MS,
+                 max_size: int = settings.WRITE_BATCH_MAX_SIZE):
+        self._url = url
+        self._key = key
+        self._single_url = single_url
+        self._delay = flush_ms / 1000
+        self._max_size = max_size
+        self._pending = {}
+        self._timers = {}
+        # Strong references so in-flight sends are not garbage collected
+        self._tasks = set()
+
+    async def submit(self, client, tenant_id: str, payload: dict):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (client, tenant_id)
+
+        batch = self._pending.setdefault(key, [])
+        batch.append((payload, future))
+        if len(batch) >= self._max_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self._delay, self._flush, key)
+
+        return await future
+
+    def _flush(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._send(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key, batch):
+        client, tenant_id = key
+        batch = [(payload, future) for payload, future in batch if not future.done()]
+        if not batch:
+            return
+        single = len(batch) == 1
+        url = self._single_url if single else self._url
+        try:
+            response = await client.post(
+                url,
+                content=dumps(batch[0][0] if single else {self._key: [payload for payload, _ in batch]}),
+                headers=tenant_json_headers(tenant_id),
+                follow_redirects=True
+            )
+            if not response.is_success:
+                raise UpstreamError.from_response(response, f"Request to {url} failed")
+
+            results = orjson.loads(response.content)
+            if single:
+                results = [results]
+            elif len(results) != len(batch):
+                raise UpstreamError(
+                    f"Bulk request to {url} returned {len(results)} results for {len(batch)} items",
+                    response.status_code
+                )
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # Callers that were cancelled meanwhile simply drop their result
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,161 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Optional
+from cachetools import TTLCache
+from fastapi import Request, Response
+from app.config import settings
+
+# Request headers that select a different upstream representation, so they
+# are part of the key: credentials keep one caller's response away from
+# another, and Accept-Encoding matches the (possibly compressed) raw body.
+KEY_HEADERS = ("authorization", "cookie", "accept-encoding")
+
+# Raw relayed headers that are recomputed for the buffered body
+_FRAMING_HEADERS = frozenset({b"content-length", b"transfer-encoding"})
+
+# Headers a 304 carries that update the stored response
+_REVALIDATION_HEADERS = frozenset({b"etag", b"cache-control", b"date", b"expires"})
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    etag: Optional[bytes]
+    expires: float
+    # (header, value) pairs of the request the response was stored for,
+    # for every header named in the upstream Vary
+    vary: tuple[tuple[str, Optional[str]], ...]
+
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires
+
+    def matches(self, request: Request) -> bool:
+        return all(request.headers.get(name) == value for name, value in self.vary)
+
+    def to_response(self) -> Response:
+        response = Response(content=self.body, status_code=self.status_code)
+        response.raw_headers = list(self.headers)
+        return response
+
+
+# Entries outlive their freshness (up to PROXY_CACHE_TTL) so a stale one can
+# still be revalidated with If-None-Match.
+_responses = TTLCache(maxsize=settings.PROXY_CACHE_SIZE, ttl=settings.PROXY_CACHE_TTL)
+
+
+def cache_key(tenant_id: str, url: str, request: Request) -> tuple:
+    headers = request.headers
+    return (
+        tenant_id,
+        url,
+        tuple(sorted(request.query_params.multi_items())),
+        *(headers.get(name) for name in KEY_HEADERS),
+    )
+
+
+def lookup(key: tuple, request: Request) -> Optional[CachedResponse]:
+    entry = _responses.get(key)
+    if entry is not None and entry.matches(request):
+        return entry
+    return None
+
+
+def max_age(headers, revalidated: bool = False) -> Optional[float]:
+    """How long a 200 may be served without revalidating; None if never stored.
+
+    Follows the upstream Cache-Control: no-store and private responses are
+    not kept, no-cache ones only for revalidation. The age is capped at
+    PROXY_CACHE_TTL.
+    """
+    if "set-cookie" in headers or headers.get("vary", "").strip() == "*":
+        return None
+    # Event streams never end, so they must always be relayed chunk by chunk
+    if headers.get("content-type", "").startswith("text/event-stream"):
+        return None
+    age = 0.0
+    no_cache = False
+    for directive in headers.get("cache-control", "").lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name in ("no-store", "private"):
+            return None
+        if name == "no-cache":
+            no_cache = True
+        elif name == "max-age" and value.isdigit():
+            age = float(value)
+    if no_cache:
+        age = 0.0
+    # Without a max-age the entry is only worth keeping for its ETag; a 304
+    # for an entry that has one need not repeat it
+    if age == 0.0 and not revalidated and "etag" not in headers:
+        return None
+    return min(age, settings.PROXY_CACHE_TTL)
+
+
+def fits(headers) -> bool:
+    """Whether a body is small enough to buffer; unknown lengths never are."""
+    length = headers.get("content-length")
+    return length is not None and length.isdigit() and int(length) <= settings.PROXY_CACHE_MAX_BODY
+
+
+def store(key: tuple, request: Request, upstream, relayed: list, body: bytes, age: float) -> CachedResponse:
+    headers = [(k, v) for k, v in relayed if k not in _FRAMING_HEADERS]
+    headers.append((b"content-length", str(len(body)).encode("latin-1")))
+    etag = upstream.headers.get("etag")
+    vary = tuple(
+        (name, request.headers.get(name))
+        for name in (v.strip().lower() for v in upstream.headers.get("vary", "").split(","))
+        if name
+    )
+    entry = CachedResponse(
+        status_code=upstream.status_code,
+        headers=headers,
+        body=body,
+        etag=etag.encode("latin-1") if etag is not None else None,
+        expires=time.monotonic() + age,
+        vary=vary,
+    )
+    _responses[key] = entry
+    return entry
+
+
+def refresh(key: tuple, entry: CachedResponse, upstream) -> None:
+    """Update a revalidated entry with the validators and freshness of a 304."""
+    age = max_age(upstream.headers, revalidated=True)
+    if age is None:
+        _responses.pop(key, None)
+        return
+    updated = [(k.lower(), v) for k, v in upstream.headers.raw if k.lower() in _REVALIDATION_HEADERS]
+    if updated:
+        names = {k for k, _ in updated}
+        entry.headers = [(k, v) for k, v in entry.headers if k not in names] + updated
+        for name, value in updated:
+            if name == b"etag":
+                entry.etag = value
+    entry.expires = time.monotonic() + age
+    _responses[key] = entry
+
+
+# GETs currently being fetched upstream, so concurrent misses for one key
+# share a single call. Each future resolves to the entry that call stored,
+# or None when its answer was not cacheable and waiters fetch on their own.
+_in_flight: dict[tuple, asyncio.Future] = {}
+
+
+def in_flight(key: tuple) -> Optional[asyncio.Future]:
+    return _in_flight.get(key)
+
+
+def start_flight(key: tuple) -> asyncio.Future:
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    return future
+
+
+def end_flight(key: tuple, future: asyncio.Future, entry: Optional[CachedResponse]) -> None:
+    if _in_flight.get(key) is future:
+        del _in_flight[key]
+    if not future.done():
+        future.set_result(entry)
@@ -0,0 +1,106 @@
+from graphql import GraphQLError, ValidationRule, get_named_type, get_nullable_type, is_list_type
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
+from strawberry.extensions import AddValidationRules
+
+# A list field is assumed to return this many items, so everything selected
+# underneath it costs that much more.
+LIST_WEIGHT = 5
+
+
+def _selection_cost(context, parent_type, selection_set, fragment_costs, visiting) -> tuple[int, int]:
+    """Returns (cost, depth) of a selection set.
+
+    Depth counts nested field levels below this one, as QueryDepthLimiter
+    does, with introspection fields left out. fragment_costs memoizes each
+    spread per (fragment, parent type) for the whole walk, so repeated
+    spreads cost one traversal instead of doubling; visiting holds the
+    fragments on the current path to stop at cycles.
+    """
+    cost = 0
+    depth = 0
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            cost += 1
+            name = selection.name.value
+            if selection.selection_set is None or name.startswith("__"):
+                continue
+            field = getattr(parent_type, "fields", {}).get(name)
+            field_type = get_nullable_type(field.type) if field is not None else None
+            child_cost, child_depth = _selection_cost(
+                context, get_named_type(field_type) if field_type is not None else None,
+                selection.selection_set, fragment_costs, visiting
+            )
+            depth = max(depth, child_depth + 1)
+            if field_type is None:
+                continue
+            cost += child_cost * LIST_WEIGHT if is_list_type(field_type) else child_cost
+
+        elif isinstance(selection, InlineFragmentNode):
+            type_ = parent_type
+            if selection.type_condition is not None:
+                type_ = context.schema.get_type(selection.type_condition.name.value)
+            child_cost, child_depth = _selection_cost(
+                context, type_, selection.selection_set, fragment_costs, visiting
+            )
+            cost += child_cost
+            depth = max(depth, child_depth)
+
+        elif isinstance(selection, FragmentSpreadNode):
+            name = selection.name.value
+            key = (name, getattr(parent_type, "name", None))
+            fragment_cost = fragment_costs.get(key)
+            if fragment_cost is None:
+                fragment = context.get_fragment(name)
+                # Fragment cycles are reported by the standard NoFragmentCycles rule
+                if fragment is None or name in visiting:
+                    continue
+                type_ = context.schema.get_type(fragment.type_condition.name.value)
+                visiting.add(name)
+                fragment_cost = _selection_cost(
+                    context, type_, fragment.selection_set, fragment_costs, visiting
+                )
+                visiting.discard(name)
+                fragment_costs[key] = fragment_cost
+            cost += fragment_cost[0]
+            depth = max(depth, fragment_cost[1])
+    return cost, depth
+
+
+def _complexity_rule(max_complexity: int, max_depth: int):
+    class ComplexityRule(ValidationRule):
+        def enter_operation_definition(self, node, *_args):
+            schema = self.context.schema
+            root_type = {
+                "query": schema.query_type,
+                "mutation": schema.mutation_type,
+                "subscription": schema.subscription_type,
+            }[node.operation.value]
+            if root_type is None:
+                return
+
+            cost, depth = _selection_cost(self.context, root_type, node.selection_set, {}, set())
+            if depth > max_depth:
+                self.report_error(GraphQLError(
+                    f"Query depth {depth} exceeds the maximum of {max_depth}", node
+                ))
+            if cost > max_complexity:
+                self.report_error(GraphQLError(
+                    f"Query complexity {cost} exceeds the maximum of {max_complexity}", node
+                ))
+
+    return ComplexityRule
+
+
+class ComplexityLimiter(AddValidationRules):
+    """Rejects operations that are deeper than `max_depth` or whose estimated
+    cost is above `max_complexity`.
+
+    Every field counts 1 and fields below a list count LIST_WEIGHT times, so
+    fan-out queries are refused during validation before any resolver runs.
+    Both are measured in one walk that visits each fragment once, so
+    documents that chain fragment spreads cannot make the check itself
+    exponential.
+    """
+
+    def __init__(self, max_complexity: int, max_depth: int):
+        super().__init__([_complexity_rule(max_complexity, max_depth)])
@@ -1,16 +1,15 @@
 from pydantic_settings import BaseSettings
-import os
 
 class Settings(BaseSettings):
     # REST API endpoints
-    ORDER_SERVICE_URL: str = os.getenv("ORDER_SERVICE_URL", "http://order-service:8000")
-    PAYMENT_SERVICE_URL: str = os.getenv("PAYMENT_SERVICE_URL", "http://payment-service:8000")
-    PARTNER_SERVICE_URL: str = os.getenv("PARTNER_SERVICE_URL", "http://partner-service:8000")
-    OFFER_SERVICE_URL: str = os.getenv("OFFER_SERVICE_URL", "http://offer-service:8000")
-    NOTIFICATION_SERVICE_URL: str = os.getenv("NOTIFICATION_SERVICE_URL", "http://notification-service:8000")
-    USER_SERVICE_URL: str = os.getenv("USER_SERVICE_URL", "http://user-service:8000")
-    AUTH_SERVICE_URL: str = os.getenv("AUTH_SERVICE_URL", "http://auth-service:8000")
-    REVIEW_SERVICE_URL: str = os.getenv("REVIEW_SERVICE_URL", "http://review-service:8000")
+    ORDER_SERVICE_URL: str = "http://order-service:8000"
+    PAYMENT_SERVICE_URL: str = "http://payment-service:8000"
+    PARTNER_SERVICE_URL: str = "http://partner-service:8000"
+    OFFER_SERVICE_URL: str = "http://offer-service:8000"
+    NOTIFICATION_SERVICE_URL: str = "http://notification-service:8000"
+    USER_SERVICE_URL: str = "http://user-service:8000"
+    AUTH_SERVICE_URL: str = "http://auth-service:8000"
+    REVIEW_SERVICE_URL: str = "http://review-service:8000"
     
     # gRPC endpoints (if needed in future)
     PAYMENT_SERVICE_HOST: str = "payment-grpc"
@@ -18,6 +17,47 @@ class Settings(BaseSettings):
     
     # Connection settings
     REQUEST_TIMEOUT: float = 10.0
+    CONNECT_TIMEOUT: float = 2.0
+    WRITE_TIMEOUT: float = 5.0
+    POOL_TIMEOUT: float = 1.0
+    MAX_CONNECTIONS: int = 500
+    MAX_KEEPALIVE_CONNECTIONS: int = 100
+    KEEPALIVE_EXPIRY: float = 30.0
+    # Upstream calls admitted at once by the REST proxy and GraphQL mutations
+    MAX_UPSTREAM_CONCURRENCY: int = 64
+    # httpx negotiates HTTP/2 through TLS ALPN only, so this takes effect for
+    # https:// upstreams (or an h2-terminating proxy in front of them);
+    # plain http:// services keep using pooled HTTP/1.1 connections.
+    UPSTREAM_HTTP2: bool = True
+    # Extra attempts when opening an upstream connection fails
+    UPSTREAM_CONNECT_RETRIES: int = 1
+
+    # Caching
+    LIST_CACHE_TTL: float = 2.0
+    CATALOG_CACHE_TTL: float = 10.0
+    READ_CACHE_TTL: float = 1.0
+    # How long confirm_payment / mark_read results answer retries locally
+    IDEMPOTENT_RESULT_TTL: float = 300.0
+    # REST proxy GETs: upper bound on any upstream max-age, and entries kept
+    PROXY_CACHE_TTL: float = 30.0
+    PROXY_CACHE_SIZE: int = 10_000
+    # Larger bodies, or ones without a Content-Length, are always streamed
+    PROXY_CACHE_MAX_BODY: int = 256 * 1024
+    # Set to skip memoizing parsed timestamps in the response mappers
+    DT_CACHE_DISABLED: bool = False
+
+    # Query limits, checked before any resolver runs
+    MAX_QUERY_DEPTH: int = 8
+    MAX_QUERY_COMPLEXITY: int = 1000
+    # Checked by the parser, so oversized documents are rejected before parsing completes
+    MAX_QUERY_TOKENS: int = 2000
+    # Parsed/validated documents and APQ query strings kept per process
+    QUERY_CACHE_SIZE: int = 512
+    PERSISTED_QUERY_CACHE_SIZE: int = 512
+
+    # Write batching: how long concurrent writes wait to share a bulk request
+    WRITE_BATCH_FLUSH_MS: float = 5.0
+    WRITE_BATCH_MAX_SIZE: int = 32
     
     class Config:
         env_file = ".env"
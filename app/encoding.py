@@ -0,0 +1,15 @@
+import orjson
+from decimal import Decimal
+
+
+def _default(obj):
+    # orjson serializes datetimes natively; Decimal is the one type our
+    # payloads carry that it does not, and services expect it as a string.
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(payload) -> bytes:
+    """Serialize an upstream request body in a single orjson pass."""
+    return orjson.dumps(payload, default=_default)
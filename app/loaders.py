@@ -0,0 +1,98 @@
+from operator import attrgetter
+from strawberry.dataloader import DataLoader
+from app.schemas import (
+    _OFFERS_URL,
+    _PARTNERS_URL,
+    _PAYMENTS_URL,
+    _REVIEWS_URL,
+    _USERS_URL,
+    _offer_list_decoder,
+    _partner_list_decoder,
+    _payment_list_decoder,
+    _review_list_decoder,
+    _user_list_decoder,
+)
+from app.upstream import UpstreamError
+
+
+async def _fetch_by_ids(client, url, ids, headers, decode, param="ids", key=attrgetter("id")):
+    # One upstream call per batch; results are re-ordered to match `ids`
+    # and missing ids resolve to None as DataLoader expects.
+    response = await client.get(
+        url,
+        headers=headers,
+        params={param: ",".join(map(str, ids))},
+        follow_redirects=True
+    )
+    if response.status_code != 200:
+        raise UpstreamError(f"Batch fetch from {url} returned {response.status_code}")
+
+    by_id = {key(item): item for item in decode(response.content)}
+    return [by_id.get(i) for i in ids]
+
+
+class PaymentLoader(DataLoader):
+    """Batches PaymentType lookups by id into a single payment-service call."""
+
+    def __init__(self, http_client, headers):
+        async def load_fn(ids):
+            return await _fetch_by_ids(
+                http_client, _PAYMENTS_URL, ids, headers, _payment_list_decoder.decode
+            )
+        super().__init__(load_fn=load_fn)
+
+
+class OfferLoader(DataLoader):
+    """Batches OfferType lookups by id into a single offer-service call."""
+
+    def __init__(self, http_client, headers):
+        async def load_fn(ids):
+            return await _fetch_by_ids(
+                http_client, _OFFERS_URL, ids, headers, _offer_list_decoder.decode
+            )
+        super().__init__(load_fn=load_fn)
+
+
+class PartnerLoader(DataLoader):
+    """Batches PartnerType lookups by id into a single partner-service call."""
+
+    def __init__(self, http_client, headers):
+        async def load_fn(ids):
+            return await _fetch_by_ids(
+                http_client, _PARTNERS_URL, ids, headers, _partner_list_decoder.decode
+            )
+        super().__init__(load_fn=load_fn)
+
+
+class UserLoader(DataLoader):
+    """Batches UserType lookups by id into a single user-service call."""
+
+    def __init__(self, http_client, headers):
+        async def load_fn(ids):
+            return await _fetch_by_ids(
+                http_client, _USERS_URL, ids, headers, _user_list_decoder.decode
+            )
+        super().__init__(load_fn=load_fn)
+
+
+class ReviewLoader(DataLoader):
+    """Batches review lookups by order id into a single review-service call."""
+
+    def __init__(self, http_client, headers):
+        async def load_fn(order_ids):
+            return await _fetch_by_ids(
+                http_client, _REVIEWS_URL, order_ids, headers, _review_list_decoder.decode,
+                param="order_ids", key=attrgetter("order_id")
+            )
+        super().__init__(load_fn=load_fn)
+
+
+def create_loaders(http_client, headers: dict) -> dict:
+    # Loaders cache per key, so they must be created fresh for every request.
+    return {
+        "payment": PaymentLoader(http_client, headers),
+        "offer": OfferLoader(http_client, headers),
+        "partner": PartnerLoader(http_client, headers),
+        "user": UserLoader(http_client, headers),
+        "review": ReviewLoader(http_client, headers),
+    }
@@ -1,8 +1,16 @@
-import os
 import httpx
+import orjson
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import ORJSONResponse
 from strawberry.fastapi import GraphQLRouter
+from strawberry.types import ExecutionResult
 from app.schemas import schema 
+from app.admission import AsyncAdmission
+from app.config import settings
+from app.loaders import create_loaders
+from app.persisted_queries import PersistedQueryError, resolve_persisted_query
+from app.tenant import TenantMiddleware, tenant_headers, tenant_json_headers, tenant_of
 from prometheus_fastapi_instrumentator import Instrumentator
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -14,12 +22,43 @@ from app.services.order import router as order_router
 from app.services.payment import router as payment_router
 from app.services.notification import router as notification_router
 from app.services.review import router as review_router
-from app.schemas import schema  # tvoj Strawberry schema
+
+# -----------------------
+# Lifespan
+# -----------------------
+# 1. Initialize a global HTTP client for performance (reuses connections)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The pool lives on the transport, which also retries failed connects
+    # (e.g. to an upstream that was just restarted) before giving up.
+    transport = httpx.AsyncHTTPTransport(
+        http2=settings.UPSTREAM_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.MAX_CONNECTIONS,
+            max_keepalive_connections=settings.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.KEEPALIVE_EXPIRY,
+        ),
+        retries=settings.UPSTREAM_CONNECT_RETRIES,
+    )
+    app.state.http_client = httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(
+            connect=settings.CONNECT_TIMEOUT,
+            read=settings.REQUEST_TIMEOUT,
+            write=settings.WRITE_TIMEOUT,
+            pool=settings.POOL_TIMEOUT,
+        ),
+    )
+    app.state.admission = AsyncAdmission(settings.MAX_UPSTREAM_CONCURRENCY)
+    try:
+        yield
+    finally:
+        await app.state.http_client.aclose()
 
 # -----------------------
 # FastAPI app
 # -----------------------
-app = FastAPI(title="API Gateway")
+app = FastAPI(title="API Gateway", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # -----------------------
 # Middleware
@@ -36,24 +75,42 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-# 1. Initialize a global HTTP client for performance (reuses connections)
-@app.on_event("startup")
-async def startup_event():
-    app.state.http_client = httpx.AsyncClient()
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    await app.state.http_client.aclose()
-
+app.add_middleware(TenantMiddleware)
 # 2. Add services to context so resolvers can use them
 async def get_context(request: Request, response: Response):
+    http_client = request.app.state.http_client
+    # Shared by every resolver of the operation; treat it as read-only
+    tenant_id = tenant_of(request)
+    upstream_headers = tenant_headers(tenant_id)
     return {
         "request": request,
         "response": response,
-        "http_client": request.app.state.http_client,
+        "http_client": http_client,
+        "tenant_id": tenant_id,
+        "admission": request.app.state.admission,
+        "upstream_headers": upstream_headers,
+        "upstream_json_headers": tenant_json_headers(tenant_id),
+        "loaders": create_loaders(http_client, upstream_headers),
+        "http_cache": {},
     }
 
-graphql_app = GraphQLRouter(schema, context_getter=get_context)
+class ORJSONGraphQLRouter(GraphQLRouter):
+    def encode_json(self, data) -> bytes:
+        return orjson.dumps(data)
+
+    async def parse_http_body(self, request):
+        request_data = await super().parse_http_body(request)
+        request_data.query = resolve_persisted_query(request_data.query, request_data.extensions)
+        return request_data
+
+    async def execute_operation(self, *args, **kwargs):
+        try:
+            return await super().execute_operation(*args, **kwargs)
+        except PersistedQueryError as exc:
+            # APQ clients expect a regular GraphQL error body, not an HTTP error
+            return ExecutionResult(data=None, errors=[exc.as_graphql_error()])
+
+graphql_app = ORJSONGraphQLRouter(schema, context_getter=get_context)
 app.include_router(graphql_app, prefix="/graphql")
 
 app.include_router(users_router)
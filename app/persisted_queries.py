@@ -0,0 +1,47 @@
+import hashlib
+from typing import Optional
+from cachetools import LRUCache
+from graphql import GraphQLError
+from app.config import settings
+
+# Automatic Persisted Queries (Apollo APQ): clients send only the SHA-256 of
+# a query they have sent before, keyed here by its hex digest.
+_queries = LRUCache(maxsize=settings.PERSISTED_QUERY_CACHE_SIZE)
+
+
+class PersistedQueryError(Exception):
+    """Raised when a persisted-query request cannot be resolved to a query."""
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+    def as_graphql_error(self) -> GraphQLError:
+        return GraphQLError(self.message, extensions={"code": self.code})
+
+
+def resolve_persisted_query(query: Optional[str], extensions: Optional[dict]) -> Optional[str]:
+    """Return the query to execute for a request carrying APQ extensions."""
+    if extensions is None:
+        return query
+    if not isinstance(extensions, dict):
+        raise PersistedQueryError("extensions must be an object", "BAD_USER_INPUT")
+    persisted = extensions.get("persistedQuery")
+    if not persisted:
+        return query
+    if not isinstance(persisted, dict):
+        raise PersistedQueryError("persistedQuery must be an object", "BAD_USER_INPUT")
+
+    sha256_hash = persisted.get("sha256Hash")
+    if query is None:
+        stored = _queries.get(sha256_hash)
+        if stored is None:
+            # The client retries with the full query, which registers it
+            raise PersistedQueryError("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+        return stored
+
+    if hashlib.sha256(query.encode()).hexdigest() != sha256_hash:
+        raise PersistedQueryError("provided sha does not match query", "BAD_USER_INPUT")
+    _queries[sha256_hash] = query
+    return query
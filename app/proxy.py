@@ -1,31 +1,109 @@
-import httpx
-from fastapi import Request, Response
-
-def clean_headers(headers):
-    excluded = {
-        b"host",
-        b"content-length",
-        b"connection",
-        b"origin",
-        b"referer",
-    }
+import asyncio
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from app import cache
+from app.tenant import tenant_of
+
+# ASGI servers hand us header names already lowercased, so raw names can be
+# matched against this set directly. Content-Length is kept: the body is
+# streamed through unchanged, and httpx only falls back to chunked framing
+# when no length was given.
+EXCLUDED_HEADERS = frozenset({
+    b"host",
+    b"connection",
+    b"transfer-encoding",
+    b"origin",
+    b"referer",
+})
+
+def clean_headers(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
     return [
         (k, v) for k, v in headers
-        if k.lower() not in excluded
+        if k not in EXCLUDED_HEADERS
     ]
 
+def relay_headers(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    # Copies upstream headers as raw pairs, so repeated headers such as
+    # Set-Cookie survive (dict(resp.headers) would join them into one value).
+    relayed: list[tuple[bytes, bytes]] = []
+    for name, value in headers:
+        relayed.append((name.lower(), value))
+    return relayed
+
 async def forward_request(request: Request, base_url: str, path: str):
-    async with httpx.AsyncClient() as client:
-        resp = await client.request(
+    # Bodies are piped through in both directions instead of being buffered,
+    # so the upstream response is only closed once it has been fully relayed.
+    client = request.app.state.http_client
+    url = f"{base_url}/{path}"
+    headers = clean_headers(request.headers.raw)
+
+    # GETs are answered from app.cache while fresh; a stale entry with an
+    # ETag is revalidated and served again on 304.
+    key = entry = None
+    if request.method == "GET":
+        key = cache.cache_key(tenant_of(request), url, request)
+        entry = cache.lookup(key, request)
+        if entry is not None:
+            if entry.fresh():
+                return entry.to_response()
+            if entry.etag is not None:
+                headers = [(k, v) for k, v in headers if k != b"if-none-match"]
+                headers.append((b"if-none-match", entry.etag))
+
+    # Concurrent misses for the same key wait for the first one's answer
+    # instead of each fetching it; only answers that were cached can be shared.
+    flight = None
+    if key is not None:
+        pending = cache.in_flight(key)
+        if pending is None:
+            flight = cache.start_flight(key)
+        else:
+            shared = await asyncio.shield(pending)
+            if shared is not None and shared.matches(request):
+                return shared.to_response()
+
+    stored = None
+    try:
+        has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+        upstream_request = client.build_request(
             method=request.method,
-            url=f"{base_url}/{path}",
+            url=url,
             params=request.query_params,
-            content=await request.body(),
-            headers=clean_headers(request.headers.raw),
+            content=request.stream() if has_body else None,
+            headers=headers,
         )
+        # The slot covers the call up to the response headers; relaying the body
+        # afterwards does not hold it.
+        async with request.app.state.admission.slot():
+            resp = await client.send(upstream_request, stream=True)
+
+        if key is not None:
+            if resp.status_code == 304 and entry is not None and entry.etag is not None:
+                await resp.aclose()
+                cache.refresh(key, entry, resp)
+                stored = entry
+                return entry.to_response()
+            age = None
+            if resp.status_code == 200 and cache.fits(resp.headers):
+                age = cache.max_age(resp.headers)
+            if age is not None:
+                # Cacheable and small, so buffer the raw (still encoded) body
+                # instead of streaming it
+                try:
+                    body = b"".join([chunk async for chunk in resp.aiter_raw()])
+                finally:
+                    await resp.aclose()
+                stored = cache.store(key, request, resp, relay_headers(resp.headers.raw), body, age)
+                return stored.to_response()
+    finally:
+        if flight is not None:
+            cache.end_flight(key, flight, stored)
 
-    return Response(
-        content=resp.content,
+    response = StreamingResponse(
+        resp.aiter_raw(),
         status_code=resp.status_code,
-        headers=dict(resp.headers),
-    )
\ No newline at end of file
+        background=BackgroundTask(resp.aclose),
+    )
+    response.raw_headers.extend(relay_headers(resp.headers.raw))
+    return response
\ No newline at end of file
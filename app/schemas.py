@@ -1,13 +1,232 @@
+import asyncio
+import dataclasses
+import functools
 import logging
+import sys
+import typing
 import strawberry
-from typing import List, Optional
+from cachetools import LRUCache, TTLCache
+from typing import Final, List, Optional
 from datetime import datetime
 from decimal import Decimal
-import httpx
+import msgspec
+import orjson
+from app.admission import AdmissionControl
+from app.batching import Batcher
+from app.complexity import ComplexityLimiter
 from app.config import settings
-from math import cos, radians
+from app.encoding import dumps
+from app.tenant import tenant_json_headers
+from app.upstream import UpstreamError, call
+from strawberry.extensions import MaxTokensLimiter, ParserCache, ValidationCache
 from strawberry.scalars import JSON
 
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts the trailing "Z" natively since 3.11
+    _fromiso = datetime.fromisoformat
+else:
+    def _fromiso(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+# fromisoformat builds a new timezone object for every non-UTC offset;
+# parsed datetimes share one instance per offset instead.
+_TZ_CACHE: dict = {}
+
+def _parse_dt(value: str) -> datetime:
+    dt = _fromiso(value)
+    tz = dt.tzinfo
+    if tz is not None:
+        shared = _TZ_CACHE.setdefault(dt.utcoffset(), tz)
+        if shared is not tz:
+            dt = dt.replace(tzinfo=shared)
+    return dt
+
+# Rows in one list often share timestamps (bulk-created records), and a
+# dict lookup on the raw string is cheaper than parsing it again.
+if settings.DT_CACHE_DISABLED:
+    _cached_fromiso = _parse_dt
+else:
+    _cached_fromiso = functools.lru_cache(maxsize=4096)(_parse_dt)
+
+# Upstream URLs are fixed once settings load, so resolve them a single time.
+ORDER_SERVICE_URL: Final[str] = settings.ORDER_SERVICE_URL
+PAYMENT_SERVICE_URL: Final[str] = settings.PAYMENT_SERVICE_URL
+PARTNER_SERVICE_URL: Final[str] = settings.PARTNER_SERVICE_URL
+OFFER_SERVICE_URL: Final[str] = settings.OFFER_SERVICE_URL
+NOTIFICATION_SERVICE_URL: Final[str] = settings.NOTIFICATION_SERVICE_URL
+USER_SERVICE_URL: Final[str] = settings.USER_SERVICE_URL
+AUTH_SERVICE_URL: Final[str] = settings.AUTH_SERVICE_URL
+REVIEW_SERVICE_URL: Final[str] = settings.REVIEW_SERVICE_URL
+
+_ORDERS_URL = f"{ORDER_SERVICE_URL}/list_orders"
+_PAYMENTS_URL = f"{PAYMENT_SERVICE_URL}/list_payments"
+_PARTNERS_URL = f"{PARTNER_SERVICE_URL}/list_partners"
+_NEARBY_PARTNERS_URL = f"{PARTNER_SERVICE_URL}/nearby"
+_OFFERS_URL = f"{OFFER_SERVICE_URL}/list_offers"
+_USERS_URL = f"{USER_SERVICE_URL}/list_users"
+_NOTIFICATIONS_URL = f"{NOTIFICATION_SERVICE_URL}/list_notifications"
+_REVIEWS_URL = f"{REVIEW_SERVICE_URL}/list_reviews"
+_OFFERS_BULK_URL = f"{OFFER_SERVICE_URL}/bulk"
+_AUTH_ME_URL = f"{AUTH_SERVICE_URL}/me"
+_AUTH_LOGIN_URL = f"{AUTH_SERVICE_URL}/login"
+_AUTH_SIGNUP_URL = f"{AUTH_SERVICE_URL}/signup"
+_AUTH_LOGOUT_URL = f"{AUTH_SERVICE_URL}/logout"
+
+# Auth calls carry no tenant, so they share this instead of tenant_json_headers
+_JSON_HEADERS: Final[dict] = {"Content-Type": "application/json"}
+
+# Per-id URLs are bound str.format templates: callers only fill in the id.
+_PAYMENT_CONFIRM_URL = (PAYMENT_SERVICE_URL + "/{}/confirm").format
+_PARTNER_URL = (PARTNER_SERVICE_URL + "/{}").format
+_OFFER_URL = (OFFER_SERVICE_URL + "/{}").format
+_USER_URL = (USER_SERVICE_URL + "/{}").format
+_USER_ORDERS_URL = (USER_SERVICE_URL + "/{}/orders").format
+_NOTIFICATION_READ_URL = (NOTIFICATION_SERVICE_URL + "/{}/read").format
+_PARTNER_REVIEWS_URL = (REVIEW_SERVICE_URL + "/partners/{}/reviews").format
+_PARTNER_RATING_URL = (REVIEW_SERVICE_URL + "/partners/{}/rating").format
+
+# Concurrent create_offer calls are merged into POST /offers/bulk; a lone
+# call is still a plain POST to the offer service
+_offer_batcher = Batcher(_OFFERS_BULK_URL, "offers", OFFER_SERVICE_URL)
+
+logger = logging.getLogger(__name__)
+
+# Process-wide counterpart of context["http_cache"] for reads that may be up
+# to READ_CACHE_TTL seconds stale. Tasks are stored, so a burst of identical
+# reads from concurrent requests shares one upstream call (single-flight).
+_shared_get_cache = TTLCache(maxsize=1024, ttl=settings.READ_CACHE_TTL)
+
+def _drop_failed(cache, key):
+    def callback(task):
+        if task.cancelled() or task.exception() is not None or task.result().status_code >= 500:
+            if cache.get(key) is task:
+                del cache[key]
+    return callback
+
+async def cached_get(context, url, headers, params=None, shared=False):
+    """GET through the request-scoped cache in context["http_cache"].
+
+    Identical GETs issued by different fields of one GraphQL operation share
+    a single upstream call, including while it is still in flight. With
+    `shared=True` the call is also shared with other requests for a short
+    TTL; failed calls are never kept.
+    """
+    key = (url, headers.get("X-Tenant-ID"), frozenset(params.items()) if params else None)
+    cache = _shared_get_cache if shared else context["http_cache"]
+    task = cache.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            context["http_client"].get(url, headers=headers, params=params, follow_redirects=True)
+        )
+        cache[key] = task
+        if shared:
+            task.add_done_callback(_drop_failed(cache, key))
+    # Shielded so one cancelled field does not cancel the call for the others
+    return await asyncio.shield(task)
+
+async def _get_json(context, url, service, decode=orjson.loads, shared=False):
+    """GET a single resource: 404 gives None, any other non-200 raises."""
+    response = await cached_get(context, url, context["upstream_headers"], shared=shared)
+    if response.status_code == 200:
+        return decode(response.content)
+    if response.status_code == 404:
+        return None
+    raise UpstreamError(f"{service} service returned {response.status_code}", response.status_code)
+
+# Short-lived per-process cache for tenant-wide list queries, keyed by
+# (resource, tenant_id). Writes that change a list drop its entry.
+_list_cache = TTLCache(maxsize=1024, ttl=settings.LIST_CACHE_TTL)
+
+def invalidate_list_cache(resource: str, *tenant_ids: str):
+    for tenant_id in tenant_ids:
+        _list_cache.pop((resource, tenant_id), None)
+
+async def _fetch_list(context, url, service, map_fn=None, decode=None, params=None, cache_key=None):
+    """GET a list endpoint and map each item with `map_fn`.
+
+    `decode` replaces the orjson + map step for lists that decode straight
+    into types. Non-200 answers yield an empty list; transport and decode
+    failures are re-raised naming the `service`. With `cache_key` the list
+    is served from and stored in _list_cache, but only a 200 is stored, so
+    an upstream failure is not repeated for the rest of the TTL.
+    """
+    if cache_key is not None:
+        items = _list_cache.get(cache_key)
+        if items is not None:
+            return items
+    try:
+        response = await cached_get(context, url, context["upstream_headers"], params)
+        if response.status_code != 200:
+            return []
+        if decode is not None:
+            items = decode(response.content)
+        else:
+            items = list(map(map_fn, orjson.loads(response.content)))
+    except Exception as e:
+        raise UpstreamError(f"{service} service error") from e
+
+    if cache_key is not None:
+        _list_cache[cache_key] = items
+    return items
+
+def _relay_set_cookies(response, upstream):
+    """Copy the auth service's Set-Cookie headers onto the GraphQL response."""
+    response.raw_headers.extend(
+        (b"set-cookie", value) for name, value in upstream.headers.raw
+        if name.lower() == b"set-cookie"
+    )
+
+# Partner and offer catalogs are large and change rarely: mapped lists are
+# served from _catalog_cache while fresh, then revalidated upstream with
+# If-None-Match against the ETag kept (longer) in _catalog_etags.
+_catalog_cache = TTLCache(maxsize=256, ttl=settings.CATALOG_CACHE_TTL)
+_catalog_etags = LRUCache(maxsize=256)
+
+async def _fetch_catalog(context, url, service, decode):
+    headers = context["upstream_headers"]
+    key = (url, headers["X-Tenant-ID"])
+    items = _catalog_cache.get(key)
+    if items is not None:
+        return items
+
+    # Not routed through cached_get: its shared entries outlive
+    # invalidate_catalog and are not keyed on If-None-Match.
+    client = context["http_client"]
+    validator = _catalog_etags.get(key)
+    try:
+        if validator is not None:
+            response = await client.get(
+                url, headers={**headers, "If-None-Match": validator[0]}, follow_redirects=True
+            )
+            if response.status_code == 304:
+                _catalog_cache[key] = validator[1]
+                return validator[1]
+        else:
+            response = await client.get(url, headers=headers, follow_redirects=True)
+        if response.status_code == 304:
+            # Unconditional requests must not get a 304; never answer one with []
+            response = await client.get(url, headers=headers, follow_redirects=True)
+        if response.status_code != 200:
+            return []
+        items = decode(response.content)
+        etag = response.headers.get("etag")
+        if etag is not None:
+            _catalog_etags[key] = (etag, items)
+    except Exception as e:
+        raise UpstreamError(f"{service} service error") from e
+
+    _catalog_cache[key] = items
+    return items
+
+def invalidate_catalog(url: str, *tenant_ids: str):
+    # The ETag entry is kept: the next read revalidates and gets a fresh 200
+    for tenant_id in tenant_ids:
+        _catalog_cache.pop((url, tenant_id), None)
+
+# Raw upstream answers of idempotent mutations (confirm_payment, mark_read),
+# so a retried call is answered without repeating the upstream write.
+_done_cache = TTLCache(maxsize=4096, ttl=settings.IDEMPOTENT_RESULT_TTL)
+
 # --- Types ---
 
 @strawberry.type
@@ -17,6 +236,10 @@ class OrderItemType:
     quantity: int
     order_id: int
 
+    @strawberry.field
+    async def offer(self, info) -> Optional["OfferType"]:
+        return await info.context["loaders"]["offer"].load(self.offer_id)
+
 @strawberry.type
 class OrderType:
     id: int
@@ -31,6 +254,21 @@ class OrderType:
     payment_id: Optional[int] = None
     external_id: Optional[str] = None
 
+    @strawberry.field
+    async def payment(self, info) -> Optional["PaymentType"]:
+        if self.payment_id is None:
+            return None
+        return await info.context["loaders"]["payment"].load(self.payment_id)
+
+    @strawberry.field
+    async def offers(self, info) -> List[Optional["OfferType"]]:
+        loader = info.context["loaders"]["offer"]
+        return await asyncio.gather(*(loader.load(i.offer_id) for i in self.items))
+
+    @strawberry.field
+    async def review(self, info) -> Optional["ReviewOutType"]:
+        return await info.context["loaders"]["review"].load(self.id)
+
 @strawberry.input
 class OrderItemInput:
     offer_id: int
@@ -61,10 +299,10 @@ class PaymentType:
 class PartnerType:
     id: str
     name: str
-    address: Optional[str]
-    city: Optional[str]
-    active: bool
-    tenant_id: Optional[str]
+    address: Optional[str] = None
+    city: Optional[str] = None
+    active: bool = True
+    tenant_id: Optional[str] = None
     latitude: float
     longitude: float
 
@@ -92,12 +330,12 @@ class OfferType:
     id: int
     partner_id: str
     title: str
-    description: Optional[str]
+    description: Optional[str] = None
     price_original: float
     price_discounted: float
     expiry_date: datetime
     status: str = "ACTIVE"
-    tenant_id: Optional[str]
+    tenant_id: Optional[str] = None
 
 @strawberry.input
 class CreateOfferInput:
@@ -134,14 +372,14 @@ class UserType:
     id: str
     username: str
     email: str
-    name: Optional[str]
-    surname: Optional[str]
-    address: Optional[str]
-    longitude: Optional[float]
-    latitude: Optional[float]
+    name: Optional[str] = None
+    surname: Optional[str] = None
+    address: Optional[str] = None
+    longitude: Optional[float] = None
+    latitude: Optional[float] = None
     created_at: datetime
     updated_at: datetime
-    partner_id: Optional[str]
+    partner_id: Optional[str] = None
 
 @strawberry.input
 class UserUpdateInput:
@@ -183,6 +421,8 @@ class SignupInput:
 class SignupResponse:
     status: str
     message: Optional[str] = None
+    # Set when the auth service returns the created profile with the session
+    user: Optional[UserType] = None
 
 @strawberry.type
 class LogoutResponse:
@@ -252,492 +492,330 @@ class OrderSummaryOut:
     total_amount: float
     created_at: datetime
 
-def map_payment_data(p: dict) -> PaymentType:
-    """Safely converts JSON dictionary to PaymentType with correct types."""
-    if isinstance(p.get("created_at"), str):
-        p["created_at"] = datetime.fromisoformat(p["created_at"].replace("Z", "+00:00"))
-    if isinstance(p.get("updated_at"), str):
-        p["updated_at"] = datetime.fromisoformat(p["updated_at"].replace("Z", "+00:00"))
-    
-    # Ensure amount is a Decimal object, not a string/float from JSON
-    if "amount" in p:
-        p["amount"] = Decimal(str(p["amount"]))
-        
-    return PaymentType(**p)
+@strawberry.type
+class PartnerDetailsType:
+    partner: PartnerType
+    rating: Optional[PartnerRatingOutType] = None
+    reviews: List[ReviewOutType] = strawberry.field(default_factory=list)
+
+def _make_builder(cls, defaults=None):
+    """Generates a `dict -> cls` constructor for trusted upstream values.
+
+    Strawberry's generated __init__ is keyword-only, so the builder skips it:
+    the field dict is written out as straight-line code once, at import, and
+    installed directly on a bare instance. Missing Optional fields become
+    None and fields with a default (or an entry in `defaults`) fall back to it.
+    """
+    defaults = defaults or {}
+    annotations = cls.__annotations__
+    namespace = {"_cls": cls}
+    items = []
+    for f in dataclasses.fields(cls):
+        # Resolver fields are computed on access, not stored
+        if getattr(f, "base_resolver", None) is not None:
+            continue
+        key = repr(f.name)
+        if f.name in defaults or f.default is not dataclasses.MISSING:
+            namespace[f"_default_{f.name}"] = defaults.get(f.name, f.default)
+            expr = f"d.get({key}, _default_{f.name})"
+        elif f.default_factory is not dataclasses.MISSING:
+            namespace[f"_factory_{f.name}"] = f.default_factory
+            expr = f"d[{key}] if {key} in d else _factory_{f.name}()"
+        elif type(None) in typing.get_args(annotations.get(f.name)):
+            expr = f"d.get({key})"
+        else:
+            expr = f"d[{key}]"
+        items.append(f"{key}: {expr}")
+
+    source = (
+        "def build(d):\n"
+        "    obj = _cls.__new__(_cls)\n"
+        f"    obj.__dict__ = {{{', '.join(items)}}}\n"
+        "    return obj\n"
+    )
+    exec(source, namespace)
+    return namespace["build"]
+
+_build_order_item = _make_builder(OrderItemType)
+_build_order = _make_builder(OrderType)
+_build_order_summary = _make_builder(OrderSummaryOut)
+_build_partner = _make_builder(PartnerType)
+_build_notification = _make_builder(NotificationType)
+_build_review = _make_builder(ReviewOutType)
+_build_user = _make_builder(UserType)
+_build_offer = _make_builder(OfferType)
+_build_payment = _make_builder(PaymentType)
+
+def _make_nonnull_builder(input_cls):
+    """Generates an `input -> dict` of the fields that are not None.
+
+    Update inputs are flat, so a partial-update payload needs no recursive
+    strawberry.asdict copy; the per-field checks are written out once, at
+    import, instead of looping over the field list on every call.
+    """
+    lines = ["def build(input):", "    d = {}"]
+    for f in dataclasses.fields(input_cls):
+        lines += [
+            f"    v = input.{f.name}",
+            "    if v is not None:",
+            f"        d[{f.name!r}] = v",
+        ]
+    lines.append("    return d")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["build"]
+
+_NONNULL_BUILDERS = {
+    cls: _make_nonnull_builder(cls)
+    for cls in (PartnerUpdateInput, OfferUpdateInput, UserUpdateInput)
+}
 
 def map_order_data(o: dict) -> OrderType:
     """Safely converts JSON dictionary to OrderType."""
-    if isinstance(o.get("created_at"), str):
-        o["created_at"] = datetime.fromisoformat(o["created_at"].replace("Z", "+00:00"))
+    v = o["created_at"]
+    if type(v) is str:
+        o["created_at"] = _cached_fromiso(v)
+    v = o["updated_at"]
+    if type(v) is str:
+        o["updated_at"] = _cached_fromiso(v)
     
     if "items" in o:
-        o["items"] = [OrderItemType(**item) for item in o["items"]]
+        o["items"] = list(map(_build_order_item, o["items"]))
         
-    return OrderType(**o)
+    return _build_order(o)
 
 def map_order_summary_data(o: dict) -> OrderSummaryOut:
     """Safely converts JSON dictionary to OrderSummaryOut."""
-    if isinstance(o.get("created_at"), str):
-        o["created_at"] = datetime.fromisoformat(o["created_at"].replace("Z", "+00:00"))
+    v = o["created_at"]
+    if type(v) is str:
+        o["created_at"] = _cached_fromiso(v)
     
-    return OrderSummaryOut(**o)
-
-def map_partner_data(data: dict) -> PartnerType:
-    return PartnerType(
-        id=data["id"],
-        name=data["name"],
-        address=data.get("address"),
-        city=data.get("city", None),
-        active=data.get("active", True),
-        tenant_id=data.get("tenant_id", None),
-        latitude=data["latitude"],
-        longitude=data["longitude"]
-    )
+    return _build_order_summary(o)
 
-def map_notification_data(data: dict) -> NotificationType:
-    return NotificationType(
-        id=data["id"],
-        user_id=data["user_id"],
-        type=data.get("type", "INFO"),
-        title=data["title"],
-        message=data["message"],
-        meta=data.get("meta"),
-        is_read=data.get("is_read", False)
-    )
+# Nothing to convert for these two, so the generated builders are the
+# mappers and each row skips a wrapper call.
+map_partner_data = _build_partner
+map_notification_data = _build_notification
 
 def map_review_data(data: dict) -> ReviewType:
-    if isinstance(data.get("created_at"), str):
-        data["created_at"] = datetime.fromisoformat(data["created_at"].replace("Z", "+00:00"))
-    if isinstance(data.get("updated_at"), str):
-        data["updated_at"] = datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00"))
+    v = data["created_at"]
+    if type(v) is str:
+        data["created_at"] = _cached_fromiso(v)
+    v = data["updated_at"]
+    if type(v) is str:
+        data["updated_at"] = _cached_fromiso(v)
     
-    return ReviewOutType(
-        id=data["id"],
-        order_id=data["order_id"],
-        user_id=data["user_id"],
-        partner_id=data["partner_id"],
-        rating=data["rating"],
-        comment=data.get("comment"),
-        created_at=data["created_at"],
-        updated_at=data["updated_at"]
-    )
+    return _build_review(data)
 
 def map_user_data(data: dict) -> UserType:
-    if isinstance(data.get("created_at"), str):
-        data["created_at"] = datetime.fromisoformat(data["created_at"].replace("Z", "+00:00"))
-    if isinstance(data.get("updated_at"), str):
-        data["updated_at"] = datetime.fromisoformat(data["updated_at"].replace("Z", "+00:00"))
+    v = data["created_at"]
+    if type(v) is str:
+        data["created_at"] = _cached_fromiso(v)
+    v = data["updated_at"]
+    if type(v) is str:
+        data["updated_at"] = _cached_fromiso(v)
     
-    return UserType(
-        id=data["id"],
-        username=data["username"],
-        email=data["email"],
-        name=data.get("name"),
-        surname=data.get("surname"),
-        address=data.get("address"),
-        longitude=data.get("longitude"),
-        latitude=data.get("latitude"),
-        created_at=data["created_at"],
-        updated_at=data["updated_at"],
-        partner_id=data.get("partner_id")
-    )
+    return _build_user(data)
 
 def map_offer_data(data: dict) -> OfferType:
-    if not isinstance(data.get("expiry_date"), str):
-        data["expiry_date"] = datetime.fromisoformat(data["expiry_date"].replace("Z", "+00:00"))
+    v = data["expiry_date"]
+    if type(v) is str:
+        data["expiry_date"] = _cached_fromiso(v)
     
-    return OfferType(
-        id=data["id"],
-        partner_id=data["partner_id"],
-        title=data["title"],
-        description=data.get("description"),
-        price_original=data["price_original"],
-        price_discounted=data["price_discounted"],
-        expiry_date=data["expiry_date"],
-        status=data.get("status", "ACTIVE"),
-        tenant_id=data.get("tenant_id")
+    return _build_offer(data)
+
+def map_payment_data(data: dict) -> PaymentType:
+    v = data["created_at"]
+    if type(v) is str:
+        data["created_at"] = _cached_fromiso(v)
+    v = data["updated_at"]
+    if type(v) is str:
+        data["updated_at"] = _cached_fromiso(v)
+    data["amount"] = Decimal(str(data["amount"]))
+    
+    return _build_payment(data)
+
+class _LenientDecoder:
+    """Decodes straight into a type with msgspec, falling back to `map_fn`.
+
+    The strict msgspec decoder is the fast path: timestamps and Decimals are
+    parsed in C and no intermediate dicts are built. Bodies it rejects but
+    the mappers accept (a date-only timestamp, an int id in a str field)
+    are decoded again with orjson and mapped row by row, so one such row
+    does not fail the whole list.
+    """
+
+    def __init__(self, type_, map_fn, many: bool = False):
+        self._decoder = msgspec.json.Decoder(List[type_] if many else type_)
+        self._map = map_fn
+        self._many = many
+
+    def decode(self, content: bytes):
+        try:
+            return self._decoder.decode(content)
+        except msgspec.ValidationError:
+            data = orjson.loads(content)
+            return list(map(self._map, data)) if self._many else self._map(data)
+
+_payment_decoder = _LenientDecoder(PaymentType, map_payment_data)
+_payment_list_decoder = _LenientDecoder(PaymentType, map_payment_data, many=True)
+# Optional fields of partners, offers and users carry defaults, so records
+# that omit them still take the fast path.
+_partner_list_decoder = _LenientDecoder(PartnerType, map_partner_data, many=True)
+_partner_decoder = _LenientDecoder(PartnerType, map_partner_data)
+_offer_list_decoder = _LenientDecoder(OfferType, map_offer_data, many=True)
+_user_list_decoder = _LenientDecoder(UserType, map_user_data, many=True)
+_review_list_decoder = _LenientDecoder(ReviewOutType, map_review_data, many=True)
+
+def _make_payload_fn(input_cls, convert=None, exclude=(), omit_none=()):
+    """Build an `input -> dict` converter for a strawberry input once, at import.
+
+    `convert` maps field names to value transforms, `exclude` drops fields
+    from the payload and `omit_none` leaves a field out while it is None.
+    """
+    convert = convert or {}
+    fields = tuple(
+        (f.name, convert.get(f.name), f.name in omit_none)
+        for f in dataclasses.fields(input_cls) if f.name not in exclude
     )
 
+    def to_payload(input) -> dict:
+        payload = {}
+        for name, fn, skip_none in fields:
+            value = getattr(input, name)
+            if value is None:
+                if not skip_none:
+                    payload[name] = None
+            else:
+                payload[name] = fn(value) if fn is not None else value
+        return payload
+
+    return to_payload
+
+# Decimal amounts and datetimes are left as-is; app.encoding.dumps writes
+# them as a decimal string and an ISO 8601 string respectively. The order
+# service's contract takes the amount as a decimal string; moving to
+# integer cents needs a coordinated change there.
+_create_order_to_payload = _make_payload_fn(CreateOrderInput, convert={
+    "items": lambda items: [{"offer_id": i.offer_id, "quantity": i.quantity} for i in items],
+})
+_create_partner_to_payload = _make_payload_fn(CreatePartnerInput)
+_create_offer_to_payload = _make_payload_fn(
+    CreateOfferInput,
+    exclude=("tenant_id",),
+    omit_none=("description",),
+)
+_create_review_to_payload = _make_payload_fn(RatingInput, omit_none=("comment",))
+
 # --- Resolvers ---
 
 @strawberry.type
 class Query:
     @strawberry.field
     async def get_orders(self, info) -> List[OrderType]:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                # Note: Removed trailing slash if your FastAPI route doesn't strictly require it
-                response = await client.get(
-                    f"{settings.ORDER_SERVICE_URL}/list_orders", 
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-                if response.status_code != 200:
-                    return []
-
-                
-                return [map_order_data(o) for o in response.json()]
-            except Exception as e:
-                raise Exception(f"Order service error: {str(e)}")
+        return await _fetch_list(
+            info.context, _ORDERS_URL, "Order", map_order_data,
+            cache_key=("orders", info.context["tenant_id"])
+        )
     
     @strawberry.field
     async def get_payments(self, info) -> List[PaymentType]:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{settings.PAYMENT_SERVICE_URL}/list_payments", 
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-                if response.status_code != 200:
-                    return []
-                
-                return [map_payment_data(p) for p in response.json()]
-            except Exception as e:
-                raise Exception(f"Payment service error: {str(e)}")
-    
+        return await _fetch_list(
+            info.context, _PAYMENTS_URL, "Payment", decode=_payment_list_decoder.decode,
+            cache_key=("payments", info.context["tenant_id"])
+        )
 
     @strawberry.field
     async def all_partners(self, info) -> List[PartnerType]:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        # 2. Uporabimo httpx za klic na Partner mikrostoritev
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{settings.PARTNER_SERVICE_URL}/list_partners", # URL tvoje mikrostoritve
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-                
-                if response.status_code != 200:
-                    return []
-                
-                # 3. Pretvorimo JSON odgovor v seznam PartnerType objektov
-                # map_partner_data je tvoja funkcija, ki preslika JSON v GraphQL tip
-                return [map_partner_data(p) for p in response.json()]
-                
-            except Exception as e:
-                # 4. Centralizirano javljanje napak
-                raise Exception(f"Partner service communication error: {str(e)}")
+        return await _fetch_catalog(info.context, _PARTNERS_URL, "Partner", _partner_list_decoder.decode)
 
     @strawberry.field
     async def partner_by_id(self, info, partner_id: str) -> Optional[PartnerType]:
-        # 1. Priprava requesta in tenant ID-ja
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        
-        # 2. HTTP klic na Partner mikrostoritev
-        async with httpx.AsyncClient() as client:
-            try:
-                # URL vsebuje ID partnerja
-                url = f"{settings.PARTNER_SERVICE_URL}/{partner_id}"
-                
-                response = await client.get(
-                    url, 
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-                
-                # Če partnerja ni (404), vrnemo None
-                if response.status_code == 404:
-                    return None
-            
-                    
-                if response.status_code != 200:
-                    raise Exception(f"Partner service returned {response.status_code}")
-                
-                # 3. Mapiranje rezultata
-                partner_json = response.json()
-                return map_partner_data(partner_json)
-                
-            except Exception as e:
-                raise Exception(f"Error fetching partner {partner_id}: {str(e)}")
+        # Batched with every other partner lookup in the same operation
+        return await info.context["loaders"]["partner"].load(partner_id)
 
     @strawberry.field
     async def nearby_partners(self, info, lat: float, lng: float, radius_km: float = 5.0) -> List[PartnerType]:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        
-        http_client = info.context["http_client"]
-        
-        url = f"{settings.PARTNER_SERVICE_URL}/nearby"
         params = {"lat": lat, "lng": lng, "radius_km": radius_km}
-        
-        try:
-            print(f"Calling Partner service: {url} with params {params}")
-            response = await http_client.get(
-                url, 
-                headers={"X-Tenant-ID": tenant_id},
-                timeout=settings.REQUEST_TIMEOUT,
-                follow_redirects=True,
-                params=params
-            )
-            
-            print(f"Partner service returned: {response.status_code}")
-            if response.status_code == 404:
-                return []
-            
-            if response.status_code != 200:
-                raise Exception(f"Partner service returned {response.status_code}")
-            
-            partner_json = response.json()
-            print(f"Partner JSON: {partner_json}")
-            result = [map_partner_data(p) for p in partner_json]
-            print(f"Mapped result: {result}")
-            return result
-        
-        except Exception as e:
-            print(f"Resolver error: {str(e)}")
-            raise
+        return await _fetch_list(
+            info.context, _NEARBY_PARTNERS_URL, "Partner",
+            decode=_partner_list_decoder.decode, params=params
+        )
     
     @strawberry.field
     async def get_offers(self, info) -> List[OfferType]:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{settings.OFFER_SERVICE_URL}/list_offers", 
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-                if response.status_code != 200:
-                    return []
-                
-                return [map_offer_data(p) for p in response.json()]
-            except Exception as e:
-                raise Exception(f"Payment service error: {str(e)}")
+        return await _fetch_catalog(info.context, _OFFERS_URL, "Offer", _offer_list_decoder.decode)
 
     @strawberry.field
     async def offer_by_id(self, info, offer_id: int) -> Optional[OfferType]:
-        # 1. Priprava requesta in tenant ID-ja
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        
-        # 2. HTTP klic na Partner mikrostoritev
-        async with httpx.AsyncClient() as client:
-            try:
-                # URL vsebuje ID partnerja
-                url = f"{settings.OFFER_SERVICE_URL}/{offer_id}"
-                
-                response = await client.get(
-                    url, 
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-                
-                # Če partnerja ni (404), vrnemo None
-                if response.status_code == 404:
-                    return None
-            
-                    
-                if response.status_code != 200:
-                    raise Exception(f"Offer service returned {response.status_code}")
-                
-                # 3. Mapiranje rezultata
-                offer_json = response.json()
-                return map_offer_data(offer_json)
-                
-            except Exception as e:
-                raise Exception(f"Error fetching offer {offer_id}: {str(e)}")
+        # Batched with every other offer lookup in the same operation
+        return await info.context["loaders"]["offer"].load(offer_id)
     
     @strawberry.field
     async def all_notifications(self, info, user_id: str, unread_only: bool = False) -> List[NotificationType]:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{settings.NOTIFICATION_SERVICE_URL}/list_notifications", # URL tvoje mikrostoritve
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True,
-                    params={
-                        "user_id": user_id, 
-                        "unread_only": unread_only
-                    }
-                )
-                
-                if response.status_code != 200:
-                    return []
-                
-                # 3. Pretvorimo JSON odgovor v seznam PartnerType objektov
-                # map_partner_data je tvoja funkcija, ki preslika JSON v GraphQL tip
-                return [map_notification_data(p) for p in response.json()]
-                
-            except Exception as e:
-                # 4. Centralizirano javljanje napak
-                raise Exception(f"Partner service communication error: {str(e)}")
+        params = {"user_id": user_id, "unread_only": unread_only}
+        return await _fetch_list(
+            info.context, _NOTIFICATIONS_URL, "Notification", map_notification_data, params=params
+        )
 
     @strawberry.field
     async def all_users(self, info) -> List[UserType]:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{settings.USER_SERVICE_URL}/list_users", # URL tvoje mikrostoritve
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-                
-                if response.status_code != 200:
-                    return []
-                
-                # 3. Pretvorimo JSON odgovor v seznam PartnerType objektov
-                # map_partner_data je tvoja funkcija, ki preslika JSON v GraphQL tip
-                return [map_user_data(p) for p in response.json()]
-                
-            except Exception as e:
-                # 4. Centralizirano javljanje napak
-                raise Exception(f"Partner service communication error: {str(e)}")
+        return await _fetch_list(info.context, _USERS_URL, "User", decode=_user_list_decoder.decode)
 
     @strawberry.field
     async def user_by_id(self, info, user_id: str) -> Optional[UserType]:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                # URL vsebuje ID partnerja
-                url = f"{settings.USER_SERVICE_URL}/{user_id}"
-                
-                response = await client.get(
-                    url, 
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-                
-                # Če partnerja ni (404), vrnemo None
-                if response.status_code == 404:
-                    return None
-            
-                    
-                if response.status_code != 200:
-                    raise Exception(f"User service returned {response.status_code}")
-                
-                # 3. Mapiranje rezultata
-                user_json = response.json()
-                return map_user_data(user_json)
-                
-            except Exception as e:
-                raise Exception(f"Error fetching offer {user_id}: {str(e)}")
+        # Batched with every other user lookup in the same operation
+        return await info.context["loaders"]["user"].load(user_id)
     
     @strawberry.field
     async def list_partner_reviews(self, info, partner_id: str) -> List[ReviewOutType]:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                # URL vsebuje ID partnerja
-                url = f"{settings.REVIEW_SERVICE_URL}/partners/{partner_id}/reviews"
-                
-                response = await client.get(
-                    url, 
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-                
-                # Če partnerja ni (404), vrnemo None
-                if response.status_code == 404:
-                    return None
-            
-                    
-                if response.status_code != 200:
-                    return []
-                
-                # 3. Mapiranje rezultata
-                review_json = response.json()
-
-                return [map_review_data(r) for r in review_json]
-                
-            except Exception as e:
-                raise Exception(f"Error fetching review {partner_id}: {str(e)}")
+        # Če partnerja ni (404) ali napake, vrnemo prazen seznam
+        url = _PARTNER_REVIEWS_URL(partner_id)
+        return await _fetch_list(info.context, url, "Review", decode=_review_list_decoder.decode)
     
     @strawberry.field
-    async def get_partner_rating(self, info, partner_id: str) -> PartnerRatingOutType:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                # URL vsebuje ID partnerja
-                url = f"{settings.REVIEW_SERVICE_URL}/partners/{partner_id}/rating"
-                
-                response = await client.get(
-                    url, 
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-                
-                # Če partnerja ni (404), vrnemo None
-                if response.status_code == 404:
-                    return None
-            
-                    
-                if response.status_code != 200:
-                    return []
-                
-                # 3. Mapiranje rezultata
-                review_json = response.json()
-
-                return PartnerRatingOutType(**review_json)
-                
-            except Exception as e:
-                raise Exception(f"Error fetching review {partner_id}: {str(e)}")
-            
+    async def get_partner_rating(self, info, partner_id: str) -> Optional[PartnerRatingOutType]:
+        # Če partnerja ni (404), vrnemo None
+        data = await _get_json(info.context, _PARTNER_RATING_URL(partner_id), "Review", shared=True)
+        return None if data is None else PartnerRatingOutType(**data)
+
+    @strawberry.field
+    async def partner_details(self, info, partner_id: str) -> Optional[PartnerDetailsType]:
+        # Partner, rating and reviews live in independent services, so the
+        # three calls are awaited together instead of one after another.
+        partner, rating, reviews = await asyncio.gather(
+            _get_json(info.context, _PARTNER_URL(partner_id), "Partner", decode=_partner_decoder.decode),
+            _get_json(info.context, _PARTNER_RATING_URL(partner_id), "Review", shared=True),
+            _get_json(info.context, _PARTNER_REVIEWS_URL(partner_id), "Review", decode=_review_list_decoder.decode),
+            return_exceptions=True,
+        )
+
+        if isinstance(partner, Exception):
+            raise UpstreamError(f"Error fetching partner {partner_id}") from partner
+        if partner is None:
+            return None
+
+        # Rating and reviews are optional extras; a failing review service
+        # should not hide the partner itself, but it should be visible.
+        if isinstance(rating, Exception):
+            logger.warning("Rating for partner %s unavailable: %s", partner_id, rating)
+            rating = None
+        if isinstance(reviews, Exception):
+            logger.warning("Reviews for partner %s unavailable: %s", partner_id, reviews)
+            reviews = None
+
+        return PartnerDetailsType(
+            partner=partner,
+            rating=None if rating is None else PartnerRatingOutType(**rating),
+            reviews=reviews or []
+        )
 
     @strawberry.field
     async def user_order_history(self, info, user_id: str) -> List[OrderSummaryOut]:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                url = f"{settings.USER_SERVICE_URL}/{user_id}/orders"
-                
-                response = await client.get(
-                    url, 
-                    headers={"X-Tenant-ID": tenant_id},
-                    timeout=settings.REQUEST_TIMEOUT,
-                    follow_redirects=True
-                )
-
-                print("debug response:", response.status_code, response.text)
-                
-                if response.status_code == 404:
-                    return []
-                    
-                if response.status_code != 200:
-                    raise Exception(f"User service returned {response.status_code}")
-                
-                orders_data = response.json()["orders"]
-
-                return [map_order_summary_data(o) for o in orders_data]
-                
-            except Exception as e:
-                raise Exception(f"Error fetching orders for user {user_id}: {str(e)}")
+        data = await _get_json(info.context, _USER_ORDERS_URL(user_id), "User")
+        if data is None:
+            return []
+        return list(map(map_order_summary_data, data["orders"]))
     
     @strawberry.field
     async def me(self, info: strawberry.Info) -> Optional[UserMe]:
@@ -749,14 +827,14 @@ class Query:
 
         # 2. Forward them to the Auth MS /me endpoint
         auth_resp = await http_client.get(
-            f"{settings.AUTH_SERVICE_URL}/me",
+            _AUTH_ME_URL,
             cookies=cookies
         )
 
         if auth_resp.status_code != 200:
             return None
 
-        data = auth_resp.json()
+        data = orjson.loads(auth_resp.content)
         return UserMe(**data)
 
     # @strawberry.field
@@ -776,7 +854,7 @@ class Query:
 
     #     # 2. Forward to the /check endpoint
     #     auth_resp = await http_client.get(
-    #         f"{settings.AUTH_SERVICE_URL}/auth/check",
+    #         f"{AUTH_SERVICE_URL}/auth/check",
     #         headers=headers
     #     )
 
@@ -794,226 +872,150 @@ class Mutation:
     @strawberry.field
     async def create_order(self, info, input: CreateOrderInput) -> OrderType:
         first_offer_id = input.items[0].offer_id
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
+        tenant_id = info.context["tenant_id"]
+        client = info.context["http_client"]
         
-        async with httpx.AsyncClient() as client:
-            partner_res_tenant = await client.get(
-                f"{settings.PARTNER_SERVICE_URL}/{input.partner_id}"
-            )
+        partner_res_tenant = await client.get(
+            _PARTNER_URL(input.partner_id)
+        )
 
-            real_tenant = partner_res_tenant.json().get("tenant_id", "public")
-            logging.info(f"Real tenant ! {real_tenant}")
-            response = await client.post(
-                f"{settings.ORDER_SERVICE_URL}",
-                json={
-                    "user_id": input.user_id,
-                    "items": [{"offer_id": i.offer_id, "quantity": i.quantity} for i in input.items],
-                    "amount": str(input.amount),
-                    "partner_id": input.partner_id
-                },
-                headers={"X-Tenant-ID": real_tenant},
-                follow_redirects=True
-            )
-            if response.status_code not in [200, 201]:
-                raise Exception(f"Order creation failed: {response.text}")
-            
-            print("Response", response.json())
-            print("Mapped", map_order_data(response.json()))
-            
-            return map_order_data(response.json())
+        real_tenant = orjson.loads(partner_res_tenant.content).get("tenant_id", "public")
+        logger.debug("Real tenant: %s", real_tenant)
+        data = await call(
+            info.context, "POST", ORDER_SERVICE_URL, "Order creation",
+            payload=_create_order_to_payload(input),
+            headers=tenant_json_headers(real_tenant), expect=None
+        )
+        
+        invalidate_list_cache("orders", tenant_id, real_tenant)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Order service response: %s", data)
+        
+        return map_order_data(data)
     @strawberry.field
     async def create_partner(self, info, input: CreatePartnerInput) -> PartnerType:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
+        data = await call(
+            info.context, "POST", PARTNER_SERVICE_URL, "Partner creation",
+            payload=_create_partner_to_payload(input), expect=None
+        )
         
-        async with httpx.AsyncClient() as client:
-            payload = {
-                "name": input.name,
-                "active": input.active,
-                "address": input.address,
-                "latitude": input.latitude,
-                "longitude": input.longitude,
-                "tenant_id": input.tenant_id
-            }
-            
-            response = await client.post(
-                f"{settings.PARTNER_SERVICE_URL}",
-                json=payload,
-                headers={"X-Tenant-ID": tenant_id},
-                follow_redirects=True
-            )
-            if response.status_code not in [200, 201]:
-                raise Exception(f"Partner creation failed: {response.text}")
-            
-            return map_partner_data(response.json())
+        invalidate_catalog(_PARTNERS_URL, info.context["tenant_id"])
+        return map_partner_data(data)
 
     @strawberry.mutation
     async def update_partner(self, info, partner_id: str, input: PartnerUpdateInput) -> PartnerType:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
         
-        update_data = strawberry.asdict(input)
-        update_data = {k: v for k, v in update_data.items() if v is not None}
-
-        async with httpx.AsyncClient() as client:
-            url = f"{settings.PARTNER_SERVICE_URL}/{partner_id}"
-            
-            # 3. Make the remote call
-            response = await client.put(
-                url, 
-                json=update_data, 
-                headers={"X-Tenant-ID": tenant_id}
-            )
-            
-            # 4. Handle Errors
-            if response.status_code == 404:
-                raise Exception(f"Partner {partner_id} not found in remote service.")
-            elif response.status_code != 200:
-                raise Exception(f"Failed to update partner: {response.text}")
+        update_data = _NONNULL_BUILDERS[PartnerUpdateInput](input)
 
-            # 5. Return the updated object
-            return PartnerType(**response.json())
+        data = await call(
+            info.context, "PUT", _PARTNER_URL(partner_id), "Partner update",
+            payload=update_data, not_found=f"Partner {partner_id} not found in remote service."
+        )
+
+        invalidate_catalog(_PARTNERS_URL, info.context["tenant_id"])
+        # Return the updated object
+        return map_partner_data(data)
 
     @strawberry.mutation
     async def delete_partner(self, info, partner_id: str) -> bool:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
         
-        async with httpx.AsyncClient() as client:
-            url = f"{settings.PARTNER_SERVICE_URL}/{partner_id}"
-            response = await client.delete(url, headers={"X-Tenant-ID": tenant_id}, follow_redirects=True)
-            
-            if response.status_code != 204:
-                raise Exception(f"Partner not successfully deleted: {response.text}")
-            
-            return True
+        await call(info.context, "DELETE", _PARTNER_URL(partner_id), "Partner deletion", expect=(204,))
+        
+        invalidate_catalog(_PARTNERS_URL, info.context["tenant_id"])
+        return True
 
     @strawberry.field
     async def create_offer(self, info, input: CreateOfferInput) -> OfferType:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
+        tenant_id = info.context["tenant_id"]
         
-        async with httpx.AsyncClient() as client:
-            payload = {
-                "partner_id": input.partner_id,
-                "title": input.title,
-                "price_original": input.price_original,
-                "price_discounted": input.price_discounted,
-                "expiry_date": input.expiry_date.isoformat()
-            }
-
-            if input.description is not None:
-                payload["description"] = input.description
-            
-            response = await client.post(
-                f"{settings.OFFER_SERVICE_URL}",
-                json=payload,
-                headers={"X-Tenant-ID": tenant_id},
-                follow_redirects=True
-            )
-            if response.status_code not in [200, 201]:
-                raise Exception(f"Offer creation failed: {response.text}")
-            
-            return map_offer_data(response.json())
+        result = await _offer_batcher.submit(
+            info.context["http_client"], tenant_id, _create_offer_to_payload(input)
+        )
+        invalidate_catalog(_OFFERS_URL, tenant_id)
+        return map_offer_data(result)
+
+    @strawberry.mutation
+    async def create_offers(self, info, inputs: List[CreateOfferInput]) -> List[OfferType]:
+        # One bulk request instead of a POST per offer
+        data = await call(
+            info.context, "POST", _OFFERS_BULK_URL, "Bulk offer creation",
+            payload={"offers": list(map(_create_offer_to_payload, inputs))}, expect=None
+        )
+
+        invalidate_catalog(_OFFERS_URL, info.context["tenant_id"])
+        return list(map(map_offer_data, data))
     
     @strawberry.mutation
     async def update_offer(self, info, offer_id: int, input: OfferUpdateInput) -> OfferType:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
         
-        update_data = strawberry.asdict(input)
-        update_data = {k: v for k, v in update_data.items() if v is not None}
-
-        async with httpx.AsyncClient() as client:
-            url = f"{settings.OFFER_SERVICE_URL}/{offer_id}"
-            
-            # 3. Make the remote call
-            response = await client.put(
-                url, 
-                json=update_data, 
-                headers={"X-Tenant-ID": tenant_id}
-            )
-            
-            # 4. Handle Errors
-            if response.status_code == 404:
-                raise Exception(f"Offer {offer_id} not found in remote service.")
-            elif response.status_code != 200:
-                raise Exception(f"Failed to update offer: {response.text}")
+        update_data = _NONNULL_BUILDERS[OfferUpdateInput](input)
+
+        data = await call(
+            info.context, "PUT", _OFFER_URL(offer_id), "Offer update",
+            payload=update_data, not_found=f"Offer {offer_id} not found in remote service."
+        )
 
-            # 5. Return the updated object
-            return OfferType(**response.json())
+        invalidate_catalog(_OFFERS_URL, info.context["tenant_id"])
+        # Return the updated object
+        return map_offer_data(data)
 
     @strawberry.mutation
     async def delete_offer(self, info, offer_id: int) -> bool:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
         
-        async with httpx.AsyncClient() as client:
-            url = f"{settings.OFFER_SERVICE_URL}/{offer_id}"
-            response = await client.delete(url, headers={"X-Tenant-ID": tenant_id}, follow_redirects=True)
-            
-            if response.status_code != 204:
-                raise Exception(f"Offer not successfully deleted: {response.text}")
-            
-            return True
+        await call(info.context, "DELETE", _OFFER_URL(offer_id), "Offer deletion", expect=(204,))
+        
+        invalidate_catalog(_OFFERS_URL, info.context["tenant_id"])
+        return True
 
     @strawberry.field
     async def confirm_payment(self, info, payment_id: int, external_id: str) -> PaymentType:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
+        tenant_id = info.context["tenant_id"]
+        
+        key = ("payment_confirmed", tenant_id, payment_id, external_id)
+        content = _done_cache.get(key)
+        if content is not None:
+            return _payment_decoder.decode(content)
+
+        content = await call(
+            info.context, "POST", _PAYMENT_CONFIRM_URL(payment_id), "Payment confirmation",
+            params={"external_id": external_id}, decode=None
+        )
         
-        async with httpx.AsyncClient() as client:
-            params = {"external_id": external_id}
-            url = f"{settings.PAYMENT_SERVICE_URL}/{payment_id}/confirm"
-            response = await client.post(url, headers={"X-Tenant-ID": tenant_id}, params=params, follow_redirects=True)
-            
-            if response.status_code != 200:
-                raise Exception(f"Payment confirmation failed: {response.text}")
-            
-            return map_payment_data(response.json())
+        # Confirming a payment also moves the order's payment_status.
+        invalidate_list_cache("payments", tenant_id)
+        invalidate_list_cache("orders", tenant_id)
+        _done_cache[key] = content
+        return _payment_decoder.decode(content)
     
     @strawberry.field
     async def mark_read(self, info, notification_id: int) -> NotificationType:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
         
-        async with httpx.AsyncClient() as client:
-            url = f"{settings.NOTIFICATION_SERVICE_URL}/{notification_id}/read"
-            response = await client.post(url, headers={"X-Tenant-ID": tenant_id}, follow_redirects=True)
-            
-            if response.status_code != 200:
-                raise Exception(f"Payment confirmation failed: {response.text}")
-            
-            return map_notification_data(response.json())
-    
+        key = ("notification_read", info.context["tenant_id"], notification_id)
+        content = _done_cache.get(key)
+        if content is not None:
+            return map_notification_data(orjson.loads(content))
+
+        content = await call(
+            info.context, "POST", _NOTIFICATION_READ_URL(notification_id), "Marking notification read",
+            decode=None
+        )
+        
+        _done_cache[key] = content
+        return map_notification_data(orjson.loads(content))
+
     @strawberry.mutation
     async def update_user(self, info, user_id: str, input: UserUpdateInput) -> UserType:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
         
-        update_data = strawberry.asdict(input)
-        update_data = {k: v for k, v in update_data.items() if v is not None}
-
-        async with httpx.AsyncClient() as client:
-            url = f"{settings.USER_SERVICE_URL}/{user_id}"
-            
-            # 3. Make the remote call
-            response = await client.patch(
-                url, 
-                json=update_data, 
-                headers={"X-Tenant-ID": tenant_id}
-            )
-            
-            # 4. Handle Errors
-            if response.status_code == 404:
-                raise Exception(f"User {user_id} not found in remote service.")
-            elif response.status_code != 200:
-                raise Exception(f"Failed to update user: {response.text}")
-
-            # 5. Return the updated object
-            return map_user_data(response.json())
-    
+        update_data = _NONNULL_BUILDERS[UserUpdateInput](input)
+
+        data = await call(
+            info.context, "PATCH", _USER_URL(user_id), "User update",
+            payload=update_data, not_found=f"User {user_id} not found in remote service."
+        )
+
+        # Return the updated object
+        return map_user_data(data)
+
     @strawberry.mutation
     async def login(self, info, input: LoginRequest) -> LoginSuccessResponse:
         response = info.context["response"]
@@ -1022,17 +1024,16 @@ class Mutation:
         # 1. Forward the credentials to the Auth MS
         # No Keycloak logic here!
         auth_response = await http_client.post(
-            f"{settings.AUTH_SERVICE_URL}/login",
-            json={"username": input.username, "password": input.password}
+            _AUTH_LOGIN_URL,
+            content=dumps({"username": input.username, "password": input.password}),
+            headers=_JSON_HEADERS
         )
 
 
         if auth_response.status_code != 200:
-            raise Exception("Authentication failed")
+            raise UpstreamError("Authentication failed", auth_response.status_code)
 
-        auth_cookies = auth_response.headers.get_list("set-cookie")
-        for cookie_string in auth_cookies:
-            response.headers.append("set-cookie", cookie_string)
+        _relay_set_cookies(response, auth_response)
 
         return LoginSuccessResponse(status="ok")
     
@@ -1042,32 +1043,39 @@ class Mutation:
         http_client = info.context["http_client"]
 
         # 1. Forward signup to Flask Auth Microservice
-        try:
-            auth_resp = await http_client.post(
-                f"{settings.AUTH_SERVICE_URL}/signup",
-                json={
-                    "username": input.username,
-                    "email": input.email,
-                    "password": input.password
-                }
-            )
-
-            # 2. Check for errors from the Microservice
-            if auth_resp.status_code != 200:
-                error_data = auth_resp.json()
-                raise Exception(error_data.get("error", "Signup failed"))
-
-            # 3. RELAY COOKIES: The "Messenger" part
-            # Grab all 'Set-Cookie' headers from Flask and give them to the Browser
-            auth_cookies = auth_resp.headers.get_list("set-cookie")
-            for cookie_string in auth_cookies:
-                response.headers.append("set-cookie", cookie_string)
+        auth_resp = await http_client.post(
+            _AUTH_SIGNUP_URL,
+            content=dumps({
+                "username": input.username,
+                "email": input.email,
+                "password": input.password
+            }),
+            headers=_JSON_HEADERS
+        )
 
-            return SignupResponse(status="ok")
+        # 2. Check for errors from the Microservice
+        # The message shows up in the 'errors' array in the GraphQL response
+        if auth_resp.status_code != 200:
+            raise UpstreamError.from_response(auth_resp, "Signup failed")
+
+        # 3. RELAY COOKIES: The "Messenger" part
+        # Grab all 'Set-Cookie' headers from Flask and give them to the Browser
+        _relay_set_cookies(response, auth_resp)
+
+        # Auth services that answer {"user": {...}} save the client a
+        # separate profile fetch; older ones keep the bare status answer.
+        # The account already exists at this point, so a user object the
+        # gateway cannot read only drops it from the answer.
+        user = None
+        if auth_resp.headers.get("content-type", "").startswith("application/json"):
+            try:
+                body = orjson.loads(auth_resp.content)
+                if isinstance(body, dict) and body.get("user") is not None:
+                    user = map_user_data(body["user"])
+            except (orjson.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                logger.warning("Signup user in auth response unreadable: %r", e)
 
-        except Exception as e:
-            # This will show up in the 'errors' array in the GraphQL response
-            raise Exception(f"Signup error: {str(e)}")
+        return SignupResponse(status="ok", user=user)
 
 
     @strawberry.mutation
@@ -1076,39 +1084,33 @@ class Mutation:
         http_client = info.context["http_client"]
 
         # 1. Call the Auth Microservice logout endpoint
-        auth_resp = await http_client.post(f"{settings.AUTH_SERVICE_URL}/logout")
+        auth_resp = await http_client.post(_AUTH_LOGOUT_URL)
 
-        auth_cookies = auth_resp.headers.get_list("set-cookie")
-        for cookie_string in auth_cookies:
-            response.headers.append("set-cookie", cookie_string)
+        _relay_set_cookies(response, auth_resp)
 
         return LogoutResponse(status="logged_out")
     
     @strawberry.field
     async def create_review(self, info, input: RatingInput) -> ReviewOutType:
-        request = info.context["request"]
-        tenant_id = request.headers.get("X-Tenant-ID", "public")
         
-        async with httpx.AsyncClient() as client:
-            payload = {
-                "order_id": input.order_id,
-                "user_id": input.user_id,
-                "rating": input.rating
-            }
-
-            if input.comment is not None:
-                payload["comment"] = input.comment
-            
-            response = await client.post(
-                f"{settings.REVIEW_SERVICE_URL}",
-                json=payload,
-                headers={"X-Tenant-ID": tenant_id},
-                follow_redirects=True
-            )
-            if response.status_code not in [200, 201]:
-                raise Exception(f"Partner creation failed: {response.text}")
-            
-            return ReviewOutType(**response.json())
-
-
-schema = strawberry.Schema(query=Query, mutation=Mutation)
\ No newline at end of file
+        data = await call(
+            info.context, "POST", REVIEW_SERVICE_URL, "Review creation",
+            payload=_create_review_to_payload(input), expect=None
+        )
+        
+        return map_review_data(data)
+
+
+schema = strawberry.Schema(
+    query=Query,
+    mutation=Mutation,
+    extensions=[
+        MaxTokensLimiter(max_token_count=settings.MAX_QUERY_TOKENS),
+        ParserCache(maxsize=settings.QUERY_CACHE_SIZE),
+        ValidationCache(maxsize=settings.QUERY_CACHE_SIZE),
+        ComplexityLimiter(
+            max_complexity=settings.MAX_QUERY_COMPLEXITY, max_depth=settings.MAX_QUERY_DEPTH
+        ),
+        AdmissionControl,
+    ],
+)
\ No newline at end of file
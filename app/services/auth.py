@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Request
 from app.proxy import forward_request
+from app.config import settings
 
 router = APIRouter(prefix="/auth")
 
-AUTH_SERVICE_URL = "http://auth-service:8000"
+AUTH_SERVICE_URL = settings.AUTH_SERVICE_URL
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
 async def auth_proxy(path: str, request: Request):
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Request
 from app.proxy import forward_request
+from app.config import settings
 
 router = APIRouter(prefix="/notifications")
 
-NOTIFICATION_SERVICE_URL = "http://notification-service:8000"
+NOTIFICATION_SERVICE_URL = settings.NOTIFICATION_SERVICE_URL
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
 async def notification_proxy(path: str, request: Request):
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Request
 from app.proxy import forward_request
+from app.config import settings
 
 router = APIRouter(prefix="/offers")
 
-OFFER_SERVICE_URL = "http://offer-service:8000"
+OFFER_SERVICE_URL = settings.OFFER_SERVICE_URL
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
 async def offer_proxy(path: str, request: Request):
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Request
 from app.proxy import forward_request
+from app.config import settings
 
 router = APIRouter(prefix="/orders")
 
-ORDER_SERVICE_URL = "http://order-service:8000"
+ORDER_SERVICE_URL = settings.ORDER_SERVICE_URL
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
 async def order_proxy(path: str, request: Request):
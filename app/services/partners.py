@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Request
 from app.proxy import forward_request
+from app.config import settings
 
 router = APIRouter(prefix="/partners")
 
-PARTNERS_SERVICE_URL = "http://partner-service:8000"
+PARTNERS_SERVICE_URL = settings.PARTNER_SERVICE_URL
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
 async def partners_proxy(path: str, request: Request):
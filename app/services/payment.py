@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Request
 from app.proxy import forward_request
+from app.config import settings
 
 router = APIRouter(prefix="/payments")
 
-PAYMENT_SERVICE_URL = "http://payment-service:8000"
+PAYMENT_SERVICE_URL = settings.PAYMENT_SERVICE_URL
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
 async def payment_proxy(path: str, request: Request):
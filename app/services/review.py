@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Request
 from app.proxy import forward_request
+from app.config import settings
 
 router = APIRouter(prefix="/reviews")
 
-REVIEW_SERVICE_URL = "http://review-service:8000"
+REVIEW_SERVICE_URL = settings.REVIEW_SERVICE_URL
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
 async def review_proxy(path: str, request: Request):
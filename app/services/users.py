@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Request
 from app.proxy import forward_request
+from app.config import settings
 
 router = APIRouter(prefix="/users")
 
-USERS_SERVICE_URL = "http://user-service:8000"
+USERS_SERVICE_URL = settings.USER_SERVICE_URL
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
 async def users_proxy(path: str, request: Request):
@@ -0,0 +1,42 @@
+import functools
+from fastapi import Request
+
+TENANT_HEADER = b"x-tenant-id"
+DEFAULT_TENANT = "public"
+
+
+class TenantMiddleware:
+    """Reads X-Tenant-ID once per request and stores it in the ASGI scope."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            tenant_id = DEFAULT_TENANT
+            for name, value in scope["headers"]:
+                if name == TENANT_HEADER:
+                    tenant_id = value.decode("latin-1")
+                    break
+            scope["tenant_id"] = tenant_id
+        await self.app(scope, receive, send)
+
+
+def tenant_of(request: Request) -> str:
+    tenant_id = request.scope.get("tenant_id")
+    if tenant_id is None:
+        # Request did not pass through TenantMiddleware
+        tenant_id = request.headers.get("X-Tenant-ID", DEFAULT_TENANT)
+    return tenant_id
+
+
+# Upstream header dicts are shared between requests of the same tenant, so
+# callers must treat them as read-only (httpx copies them per request).
+@functools.lru_cache(maxsize=256)
+def tenant_headers(tenant_id: str) -> dict:
+    return {"X-Tenant-ID": tenant_id}
+
+
+@functools.lru_cache(maxsize=256)
+def tenant_json_headers(tenant_id: str) -> dict:
+    return {"X-Tenant-ID": tenant_id, "Content-Type": "application/json"}
@@ -0,0 +1,62 @@
+import httpx
+import orjson
+from typing import Optional
+from app.encoding import dumps
+
+
+class UpstreamError(Exception):
+    """A backing service failed or answered with an unexpected status.
+
+    Raised with the original exception chained as __cause__, so transport
+    errors such as httpx.TimeoutException stay inspectable in logs.
+    `status` is the upstream status code when there was an answer.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+    @classmethod
+    def from_response(cls, response, default: str) -> "UpstreamError":
+        # Only parsed once the call has already failed
+        try:
+            message = orjson.loads(response.content).get("error") or default
+        except (orjson.JSONDecodeError, AttributeError):
+            message = default
+        return cls(message, response.status_code)
+
+
+async def call(context, method: str, url: str, action: str, *, payload=None, params=None,
+               headers=None, expect=(200,), not_found: Optional[str] = None,
+               decode=orjson.loads):
+    """Send one write to a backing service and decode its answer.
+
+    Uses the shared client from the GraphQL context and the tenant's
+    headers unless `headers` is given. A status outside `expect` (any 2xx
+    when it is None) raises UpstreamError, with the `not_found` message for
+    a 404 when one is given, and transport failures raise it too. Empty
+    answers (204) give None; `decode=None` returns the raw body.
+    """
+    if headers is None:
+        headers = context["upstream_headers"] if payload is None else context["upstream_json_headers"]
+    try:
+        response = await context["http_client"].request(
+            method,
+            url,
+            content=None if payload is None else dumps(payload),
+            params=params,
+            headers=headers,
+            follow_redirects=True
+        )
+    except httpx.HTTPError as exc:
+        raise UpstreamError(f"{action} failed") from exc
+    status = response.status_code
+    ok = response.is_success if expect is None else status in expect
+    if not ok:
+        if status == 404 and not_found is not None:
+            raise UpstreamError(not_found, status)
+        raise UpstreamError(f"{action} failed: {response.text}", status)
+
+    if not response.content:
+        return None
+    return response.content if decode is None else decode(response.content)
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from app.admission import AsyncAdmission
+
+
+def test_cancel_then_release_keeps_the_slot_usable():
+    async def scenario():
+        admission = AsyncAdmission(1)
+        await admission.acquire()
+
+        waiter = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        assert admission.waiting == 1
+
+        # Cancelled while queued, then a release runs before it resumes
+        waiter.cancel()
+        admission.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert admission.active == 0
+        assert admission.waiting == 0
+        await asyncio.wait_for(admission.acquire(), timeout=1)
+        assert admission.active == 1
+
+    asyncio.run(scenario())
+
+
+def test_waiter_granted_a_slot_then_cancelled_passes_it_on():
+    async def scenario():
+        admission = AsyncAdmission(1)
+        await admission.acquire()
+
+        first = asyncio.create_task(admission.acquire())
+        second = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+
+        admission.release()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        await asyncio.wait_for(second, timeout=1)
+        assert admission.active == 1
+        assert admission.waiting == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+import time
+from typing import Optional
+
+import strawberry
+
+from app.complexity import ComplexityLimiter
+
+
+@strawberry.type
+class Node:
+    id: int
+
+    @strawberry.field
+    def child(self) -> Optional["Node"]:
+        return None
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def node(self) -> Node:
+        return Node(id=1)
+
+
+schema = strawberry.Schema(
+    query=Query, extensions=[ComplexityLimiter(max_complexity=1000, max_depth=8)]
+)
+
+
+def _fragment_bomb(levels: int) -> str:
+    # Every fragment spreads the previous one twice, so an unmemoized walk
+    # does 2^levels work for a document of a few hundred tokens.
+    fragments = ["fragment F0 on Node { id }"]
+    for i in range(1, levels + 1):
+        fragments.append(
+            f"fragment F{i} on Node {{ a: child {{ ...F{i - 1} }} b: child {{ ...F{i - 1} }} }}"
+        )
+    return f"{{ node {{ ...F{levels} }} }}\n" + "\n".join(fragments)
+
+
+def test_fragment_bomb_is_rejected_quickly():
+    started = time.perf_counter()
+    result = schema.execute_sync(_fragment_bomb(30))
+    elapsed = time.perf_counter() - started
+
+    assert result.errors
+    messages = [error.message for error in result.errors]
+    assert any("Query depth" in message for message in messages)
+    assert elapsed < 2.0
+
+
+def test_shallow_query_passes():
+    result = schema.execute_sync("{ node { id child { id } } }")
+    assert result.errors is None
+    assert result.data == {"node": {"id": 1, "child": None}}
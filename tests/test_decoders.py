@@ -0,0 +1,27 @@
+from datetime import datetime
+
+import orjson
+
+from app.schemas import _offer_list_decoder, _user_list_decoder
+
+
+def test_offer_list_accepts_date_only_expiry():
+    content = orjson.dumps([
+        {"id": 1, "partner_id": "p1", "title": "Bread", "price_original": 3.0,
+         "price_discounted": 1.5, "expiry_date": "2030-01-02T10:00:00Z"},
+        {"id": 2, "partner_id": "p1", "title": "Milk", "price_original": 2.0,
+         "price_discounted": 1.0, "expiry_date": "2030-01-03"},
+    ])
+    offers = _offer_list_decoder.decode(content)
+    assert [o.id for o in offers] == [1, 2]
+    assert offers[1].expiry_date == datetime(2030, 1, 3)
+
+
+def test_user_list_accepts_int_id():
+    content = orjson.dumps([
+        {"id": 7, "username": "ana", "email": "ana@example.com",
+         "created_at": "2024-05-01T08:00:00Z", "updated_at": "2024-05-01T08:00:00Z"},
+    ])
+    users = _user_list_decoder.decode(content)
+    assert len(users) == 1
+    assert users[0].username == "ana"
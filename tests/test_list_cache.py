@@ -0,0 +1,44 @@
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+
+from app.schemas import _fetch_list, _list_cache
+
+
+class FakeClient:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def get(self, url, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def _context(client):
+    # A fresh http_cache per call, as every GraphQL request gets its own
+    return {
+        "http_client": client,
+        "http_cache": {},
+        "upstream_headers": {"X-Tenant-ID": "t1"},
+    }
+
+
+def test_failed_fetch_is_not_cached():
+    rows = [{"id": 1}, {"id": 2}]
+    client = FakeClient(
+        SimpleNamespace(status_code=503, content=b"unavailable"),
+        SimpleNamespace(status_code=200, content=orjson.dumps(rows)),
+    )
+    key = ("orders", "test-failed-fetch")
+    _list_cache.pop(key, None)
+
+    async def fetch():
+        return await _fetch_list(_context(client), "http://orders/", "Order", dict, cache_key=key)
+
+    assert asyncio.run(fetch()) == []
+    assert asyncio.run(fetch()) == rows
+    # The 200 is kept for the TTL
+    assert asyncio.run(fetch()) == rows
+    assert client.calls == 2
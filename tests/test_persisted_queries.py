@@ -0,0 +1,20 @@
+import pytest
+
+from app.persisted_queries import PersistedQueryError, resolve_persisted_query
+
+
+@pytest.mark.parametrize("extensions", [
+    {"persistedQuery": "x"},
+    {"persistedQuery": ["sha256Hash"]},
+    "persistedQuery",
+    [{"persistedQuery": {}}],
+])
+def test_malformed_extensions_are_rejected(extensions):
+    with pytest.raises(PersistedQueryError) as exc_info:
+        resolve_persisted_query("{ __typename }", extensions)
+    assert exc_info.value.code == "BAD_USER_INPUT"
+
+
+def test_without_persisted_query_the_query_is_kept():
+    assert resolve_persisted_query("{ __typename }", None) == "{ __typename }"
+    assert resolve_persisted_query("{ __typename }", {}) == "{ __typename }"